@@ -0,0 +1,17 @@
+"""Shared Rich console, created on first use so importing modules stays light."""
+
+from functools import lru_cache
+from typing import Any
+
+
+@lru_cache(maxsize=1)
+def get_console() -> Any:
+    """Create the process-wide Rich console, importing Rich on first use."""
+    from rich.console import Console
+    return Console()
+
+
+def print_panel(message: str, title: str, style: str = "none") -> None:
+    """Print a message in a Rich panel on the shared console."""
+    from rich.panel import Panel
+    get_console().print(Panel(message, title=title, style=style))
@@ -7,14 +7,37 @@ Handles agent creation, configuration, and execution:
 - Handling agent output and events
 """
 
+import os
+import sys
+from dataclasses import dataclass
 from typing import Optional, List, Any
-from rich.console import Console
-from rich.panel import Panel
 
+from _console import get_console
 from config import DEFAULT_OPENAI_MODEL, MCP_MAX_TURNS
 from prompts import NARRATIVE_INSTRUCTIONS
 
-console = Console()
+try:
+    from agents import Runner, ItemHelpers
+    from agents.agent import Agent
+except ImportError as e:
+    Runner = ItemHelpers = Agent = None
+    _AGENTS_IMPORT_ERROR: Optional[ImportError] = e
+else:
+    _AGENTS_IMPORT_ERROR = None
+
+_RAW_RESPONSE_EVENT = "raw_response_event"
+
+
+def _require_agents_sdk() -> None:
+    """Raise if the OpenAI Agents SDK failed to import"""
+    if _AGENTS_IMPORT_ERROR is not None:
+        raise RuntimeError(f"OpenAI Agents SDK not available: {_AGENTS_IMPORT_ERROR}")
+
+
+@dataclass(frozen=True)
+class AgentResult:
+    """Outcome of an agent run"""
+    final_output: Optional[str]
 
 
 class AgentRunner:
@@ -22,14 +45,25 @@ class AgentRunner:
     
     def __init__(self, model: str = DEFAULT_OPENAI_MODEL):
         self.model = model
-        self.console = console
+        self._pending_messages: List[str] = []
+        # Skip Rich layout when output is piped or AGENT_QUIET is set
+        self._plain = not sys.stdout.isatty() or bool(os.getenv("AGENT_QUIET"))
+    
+    @property
+    def console(self) -> Any:
+        return get_console()
+    
+    def _print_panel(self, text: str, **panel_options: Any) -> None:
+        """Render text in a Rich panel, or as plain text in plain mode"""
+        if self._plain:
+            sys.stdout.write(f"[{panel_options.get('title', '')}] {text}\n")
+            return
+        from rich.panel import Panel
+        self.console.print(Panel(text, **panel_options))
     
     def create_agent(self, name: str, instructions: str, mcp_servers: List[Any]) -> Any:
         """Create an agent with MCP servers"""
-        try:
-            from agents.agent import Agent
-        except ImportError as e:
-            raise RuntimeError(f"OpenAI Agents SDK not available: {e}")
+        _require_agents_sdk()
         
         active_servers = [server for server in mcp_servers if server is not None]
         
@@ -42,35 +76,59 @@ class AgentRunner:
     
     async def run_agent_streamed(self, agent: Any, input_text: str, max_turns: int = MCP_MAX_TURNS) -> Any:
         """Execute agent with streaming output"""
-        try:
-            from agents import Runner, ItemHelpers
-        except ImportError as e:
-            raise RuntimeError(f"OpenAI Agents SDK not available: {e}")
+        _require_agents_sdk()
         
         streamed = Runner.run_streamed(agent, input=input_text, max_turns=max_turns)
-        self.console.print(Panel(input_text, title="User", style="magenta"))
+        self._print_panel(input_text, title="User", style="magenta")
         
-        async for event in streamed.stream_events():
-            await self._handle_stream_event(event)
+        try:
+            async for event in streamed.stream_events():
+                # Per-token raw events dominate the stream and are never displayed
+                if event.type == _RAW_RESPONSE_EVENT:
+                    continue
+                await self._handle_stream_event(event)
+        finally:
+            self._flush_messages()
         
         return streamed
     
     async def _handle_stream_event(self, event: Any) -> None:
         """Handle stream events"""
-        if event.type == "run_item_stream_event" and event.item.type == "message_output_item":
-            try:
-                from agents import ItemHelpers
-                text = ItemHelpers.text_message_output(event.item)
-                self.console.print(Panel(text, title="Agent", style="green"))
-            except Exception:
-                pass
+        handler = self._EVENT_HANDLERS.get(event.type)
+        if handler is not None:
+            handler(self, event)
+    
+    def _on_run_item(self, event: Any) -> None:
+        """Dispatch run item events by item type"""
+        handler = self._ITEM_HANDLERS.get(event.item.type)
+        if handler is not None:
+            handler(self, event.item)
+        else:
+            # Any other item ends a run of consecutive agent messages
+            self._flush_messages()
+    
+    def _on_message_output(self, item: Any) -> None:
+        """Buffer agent message output until the next non-message item"""
+        try:
+            self._pending_messages.append(ItemHelpers.text_message_output(item))
+        except Exception:
+            pass
+    
+    def _flush_messages(self) -> None:
+        """Display buffered agent messages as a single panel"""
+        if self._pending_messages:
+            self._print_panel("\n\n".join(self._pending_messages), title="Agent", style="green")
+            self._pending_messages.clear()
+    
+    # Event dispatch tables, keyed by the SDK's event and item type strings
+    _EVENT_HANDLERS = {"run_item_stream_event": _on_run_item}
+    _ITEM_HANDLERS = {"message_output_item": _on_message_output}
     
     
-    def display_final_result(self, result: Any) -> None:
+    def display_final_result(self, result: AgentResult) -> None:
         """Display final result"""
-        final_output: Optional[str] = getattr(result, "final_output", None)
-        if final_output:
-            self.console.print(Panel(final_output, title="Final Output"))
+        if result.final_output:
+            self._print_panel(result.final_output, title="Final Output")
 
 
 def create_playwright_agent(playwright_server: Any) -> Any:
@@ -85,9 +143,10 @@ def create_playwright_agent(playwright_server: Any) -> Any:
     )
 
 
-async def run_agent_with_task(agent: Any, task_prompt: str, max_turns: int = MCP_MAX_TURNS) -> Any:
+async def run_agent_with_task(agent: Any, task_prompt: str, max_turns: int = MCP_MAX_TURNS) -> AgentResult:
     """Run agent with task"""
     runner = AgentRunner()
-    result = await runner.run_agent_streamed(agent, task_prompt, max_turns)
+    streamed = await runner.run_agent_streamed(agent, task_prompt, max_turns)
+    result = AgentResult(final_output=streamed.final_output)
     runner.display_final_result(result)
     return result
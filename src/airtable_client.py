@@ -1,16 +1,25 @@
 from __future__ import annotations
 
+import asyncio
 import os
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from functools import lru_cache
 from typing import Any, Dict, List, Optional
 
-from rich.console import Console
-from rich.panel import Panel
+from _console import get_console, print_panel
+from config import AIRTABLE_BATCH_SIZE, AIRTABLE_MAX_CONCURRENT_REQUESTS
 
-console = Console()
 
+def _log(message: str, title: Optional[str] = None, style: Optional[str] = None) -> None:
+    """Log a message, rendered as a panel when a title is given."""
+    if title is None:
+        get_console().log(message)
+        return
 
-@dataclass
+    print_panel(message, title=title, style=style or "none")
+
+
+@dataclass(frozen=True)
 class AirtableConfig:
     """Holds Airtable credentials sourced from the environment."""
 
@@ -18,6 +27,14 @@ class AirtableConfig:
     base_id: Optional[str]
     offers_table_id: Optional[str]
     sources_table_id: Optional[str]
+    configured: bool = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(
+            self,
+            "configured",
+            bool(self.api_key and self.base_id and self.offers_table_id),
+        )
 
     @classmethod
     def from_env(cls) -> "AirtableConfig":
@@ -29,7 +46,7 @@ class AirtableConfig:
         )
 
     def is_configured(self) -> bool:
-        return all([self.api_key, self.base_id, self.offers_table_id])
+        return self.configured
 
 
 class AirtableClient:
@@ -39,22 +56,30 @@ class AirtableClient:
         if not config.is_configured():
             raise ValueError("Airtable configuration is incomplete.")
         self.config = config
+        self._api = None
         self._table = None
 
-    def _connect(self):
-        if self._table is not None:
-            return self._table
+    def _get_api(self):
+        """Return the pyairtable Api, whose HTTP session is shared by every table."""
+        if self._api is not None:
+            return self._api
 
         try:
-            from pyairtable import Table
+            from pyairtable import Api
         except ImportError as exc:
             raise RuntimeError(
                 "pyairtable is not installed. Add it to your environment with\n"
                 "  conda run -n <env> pip install pyairtable"
             ) from exc
 
-        self._table = Table(
-            self.config.api_key,
+        self._api = Api(self.config.api_key)
+        return self._api
+
+    def _connect(self):
+        if self._table is not None:
+            return self._table
+
+        self._table = self._get_api().table(
             self.config.base_id,
             self.config.offers_table_id,
         )
@@ -62,37 +87,63 @@ class AirtableClient:
 
     def create_records(self, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         if not records:
-            console.log("[yellow]No records to create in Airtable.")
+            _log("[yellow]No records to create in Airtable.")
             return []
 
         table = self._connect()
 
-        payload = [self._normalize_record(record) for record in records]
+        payload = self._build_payload(records)
         created = table.batch_create(payload)
 
-        console.print(Panel(
-            f"Created {len(created)} Airtable records.",
-            title="Airtable",
-            style="green",
-        ))
+        _log(f"Created {len(created)} Airtable records.", title="Airtable", style="green")
+        return created
+
+    async def create_records_async(self, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Create records in concurrent batches sized to Airtable's write limit."""
+        if not records:
+            _log("[yellow]No records to create in Airtable.")
+            return []
+
+        table = self._connect()
+
+        payload = self._build_payload(records)
+        chunks = [
+            payload[start : start + AIRTABLE_BATCH_SIZE]
+            for start in range(0, len(payload), AIRTABLE_BATCH_SIZE)
+        ]
+        semaphore = asyncio.Semaphore(AIRTABLE_MAX_CONCURRENT_REQUESTS)
+
+        async def _create_chunk(chunk: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+            async with semaphore:
+                return await asyncio.to_thread(table.batch_create, chunk)
+
+        results = await asyncio.gather(*(_create_chunk(chunk) for chunk in chunks))
+        created = [record for result in results for record in result]
+
+        _log(f"Created {len(created)} Airtable records.", title="Airtable", style="green")
         return created
 
     def get_all_records(self, table_id: str) -> List[Dict[str, Any]]:
         """Fetch all records from a specified table."""
-        try:
-            from pyairtable import Table
-        except ImportError as exc:
-            raise RuntimeError(
-                "pyairtable is not installed. Add it to your environment with\n"
-                "  conda run -n <env> pip install pyairtable"
-            ) from exc
-
-        table = Table(self.config.api_key, self.config.base_id, table_id)
+        table = self._get_api().table(self.config.base_id, table_id)
         return table.all()
 
     @staticmethod
-    def _normalize_record(record: Dict[str, Any]) -> Dict[str, Any]:
+    def _build_payload(records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Accept either raw field dicts or objects containing a `fields` key."""
-        if "fields" in record and isinstance(record["fields"], dict):
-            return record["fields"]
-        return record
+        return [
+            record["fields"] if isinstance(record.get("fields"), dict) else record
+            for record in records
+        ]
+
+
+@lru_cache(maxsize=1)
+def get_config() -> AirtableConfig:
+    """Return the Airtable config read from the environment on first use."""
+    return AirtableConfig.from_env()
+
+
+@lru_cache(maxsize=1)
+def get_client() -> AirtableClient:
+    """Return the shared client, so reads and writes reuse one Api session."""
+    return AirtableClient(get_config())
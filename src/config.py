@@ -4,9 +4,21 @@ DEFAULT_OPENAI_MODEL = "gpt-5-nano"
 DEFAULT_OPENAI_TIMEOUT = 120.0  # Increased from 60.0
 DEFAULT_OPENAI_MAX_RETRIES = 10  # Increased from 3
 
+# OpenAI HTTP connection pool sizing
+DEFAULT_OPENAI_MAX_CONNECTIONS = 1000
+DEFAULT_OPENAI_MAX_KEEPALIVE_CONNECTIONS = 100
+DEFAULT_OPENAI_KEEPALIVE_EXPIRY = 60.0  # Seconds
+
 # Delay between processing sources to reduce rate limits
 DEFAULT_DELAY_BETWEEN_SOURCES = 10  # Seconds
 
+# Sources scraped at the same time, each in its own MCP browser session
+DEFAULT_MAX_CONCURRENT_SOURCES = 3
+
+# Airtable accepts at most 10 records per write and 5 requests/second per base
+AIRTABLE_BATCH_SIZE = 10
+AIRTABLE_MAX_CONCURRENT_REQUESTS = 5
+
 MCP_DEFAULT_BROWSER = "chromium"
 MCP_DEFAULT_HEADLESS = True
 MCP_DEFAULT_SSE_TIMEOUT = 100
@@ -16,3 +28,6 @@ MCP_PLAYWRIGHT_TIMEOUT_SECONDS = 102
 MCP_MAX_TURNS = 50
 
 DEBUG = False
+
+# HTML report written when running with PROFILE=1
+PROFILE_OUTPUT_PATH = "profile.html"
@@ -7,22 +7,42 @@ Handles environment validation and configuration:
 - Checking dependencies
 """
 
+import importlib.util
 import os
-from typing import Optional
+from functools import lru_cache
+from typing import Any, Optional
 
-from dotenv import load_dotenv
-from rich.console import Console
-from rich.panel import Panel
+from _console import print_panel as _print_panel
+from config import (
+    DEFAULT_OPENAI_TIMEOUT,
+    DEFAULT_OPENAI_MAX_RETRIES,
+    DEFAULT_OPENAI_MAX_CONNECTIONS,
+    DEFAULT_OPENAI_MAX_KEEPALIVE_CONNECTIONS,
+    DEFAULT_OPENAI_KEEPALIVE_EXPIRY,
+)
 
-from config import DEFAULT_OPENAI_TIMEOUT, DEFAULT_OPENAI_MAX_RETRIES
 
-
-console = Console()
+@lru_cache(maxsize=1)
+def _load_dotenv_once() -> bool:
+    """Read .env into os.environ once per process."""
+    from dotenv import load_dotenv
+    return load_dotenv()
 
 
 class EnvironmentValidator:
     """Validates and sets up the environment for the application"""
-    
+
+    # (environment variable, attribute) pairs required for Airtable access
+    _REQUIRED_AIRTABLE_VARS = (
+        ("AIRTABLE_API_KEY", "airtable_api_key"),
+        ("AIRTABLE_BASE_ID", "airtable_base_id"),
+        ("AIRTABLE_OFFERS_TABLE_ID", "airtable_offers_table_id"),
+        ("AIRTABLE_SOURCES_TABLE_ID", "airtable_sources_table_id"),
+    )
+
+    # OpenAI client registered with the SDK, shared by every validator instance
+    _openai_client: Optional[Any] = None
+
     def __init__(self):
         self.openai_api_key: Optional[str] = None
         self.airtable_api_key: Optional[str] = None
@@ -32,14 +52,15 @@ class EnvironmentValidator:
     
     def load_environment(self) -> None:
         """Load environment variables from .env file"""
-        load_dotenv()
+        _load_dotenv_once()
         
         # Load required variables
-        self.openai_api_key = os.getenv("OPENAI_API_KEY")
-        self.airtable_api_key = os.getenv("AIRTABLE_API_KEY")
-        self.airtable_base_id = os.getenv("AIRTABLE_BASE_ID")
-        self.airtable_offers_table_id = os.getenv("AIRTABLE_OFFERS_TABLE_ID")
-        self.airtable_sources_table_id = os.getenv("AIRTABLE_SOURCES_TABLE_ID")
+        env = os.environ.get
+        self.openai_api_key = env("OPENAI_API_KEY")
+        self.airtable_api_key = env("AIRTABLE_API_KEY")
+        self.airtable_base_id = env("AIRTABLE_BASE_ID")
+        self.airtable_offers_table_id = env("AIRTABLE_OFFERS_TABLE_ID")
+        self.airtable_sources_table_id = env("AIRTABLE_SOURCES_TABLE_ID")
     
     def validate_openai_config(self) -> None:
         """Validate OpenAI configuration"""
@@ -55,66 +76,69 @@ class EnvironmentValidator:
         Returns:
             True if Airtable is fully configured, False otherwise
         """
-        missing_vars = []
-        
-        if not self.airtable_api_key:
-            missing_vars.append("AIRTABLE_API_KEY")
-        if not self.airtable_base_id:
-            missing_vars.append("AIRTABLE_BASE_ID")
-        if not self.airtable_offers_table_id:
-            missing_vars.append("AIRTABLE_OFFERS_TABLE_ID")
-        if not self.airtable_sources_table_id:
-            missing_vars.append("AIRTABLE_SOURCES_TABLE_ID")
-        
+        missing_vars = [name for name, attr in self._REQUIRED_AIRTABLE_VARS if not getattr(self, attr)]
+
         if missing_vars:
-            console.print(Panel(
+            _print_panel(
                 f"Airtable configuration incomplete. Missing: {', '.join(missing_vars)}\n"
                 "Set these in your .env file to enable Airtable functionality.",
                 title="Airtable Configuration",
                 style="yellow",
-            ))
+            )
             return False
         
         return True
     
     def setup_openai_client(self) -> None:
         """Configure OpenAI client with rate limiting and timeout settings"""
+        if EnvironmentValidator._openai_client is not None:
+            return
+
         try:
             import httpx
             from openai import AsyncOpenAI
             from agents import set_default_openai_client
         except ImportError as e:
-            console.print(Panel(
+            _print_panel(
                 f"Required packages not installed: {e}\n"
                 "Install: pip install openai httpx",
                 title="Import Error",
                 style="red",
-            ))
+            )
             return
         
+        # AsyncOpenAI sends its own timeout with every request, overriding the
+        # httpx client's, so the same Timeout is given to both
+        timeout = httpx.Timeout(
+            connect=10.0,  # Connection timeout
+            read=DEFAULT_OPENAI_TIMEOUT,  # Match total timeout
+            write=10.0,    # Write timeout
+            pool=None      # Wait for a free pooled connection during bursts instead of failing
+        )
+        
         # Create custom client with timeout and retry settings
         custom_client = AsyncOpenAI(
             api_key=self.openai_api_key,
-            timeout=DEFAULT_OPENAI_TIMEOUT,
+            timeout=timeout,
             max_retries=DEFAULT_OPENAI_MAX_RETRIES,
             http_client=httpx.AsyncClient(
-                timeout=httpx.Timeout(
-                    connect=10.0,  # Connection timeout
-                    read=DEFAULT_OPENAI_TIMEOUT,  # Match total timeout
-                    write=10.0,    # Write timeout
-                    pool=10.0      # Pool timeout
-                )
+                # Multiplex concurrent agent requests over one connection when h2 is installed
+                http2=importlib.util.find_spec("h2") is not None,
+                timeout=timeout,
+                limits=httpx.Limits(
+                    max_connections=DEFAULT_OPENAI_MAX_CONNECTIONS,
+                    max_keepalive_connections=DEFAULT_OPENAI_MAX_KEEPALIVE_CONNECTIONS,
+                    keepalive_expiry=DEFAULT_OPENAI_KEEPALIVE_EXPIRY,
+                ),
             )
         )
         
         # Set this as the default client for the SDK
+        EnvironmentValidator._openai_client = custom_client
         set_default_openai_client(custom_client)
         
-        console.print(Panel(
-            f"OpenAI client configured with rate limiting: timeout={DEFAULT_OPENAI_TIMEOUT}s, max_retries={DEFAULT_OPENAI_MAX_RETRIES}.",
-            title="Rate Limiting",
-            style="green",
-        ))
+        # Plain line for the success case; panels are kept for errors and warnings
+        print(f"OpenAI client configured: timeout={DEFAULT_OPENAI_TIMEOUT}s, max_retries={DEFAULT_OPENAI_MAX_RETRIES}")
     
     def check_agents_sdk(self) -> None:
         """Check if OpenAI Agents SDK is available"""
@@ -125,21 +149,21 @@ class EnvironmentValidator:
             try:
                 from agents.mcp import MCPServerStdio
             except ImportError:
-                console.print(Panel(
+                _print_panel(
                     "MCPServerStdio not available in Agents SDK.\n"
                     "Update SDK: pip install -U git+https://github.com/openai/openai-agents-python",
                     title="SDK Update Needed",
                     style="yellow",
-                ))
+                )
         except ImportError as e:
-            console.print(Panel(
+            _print_panel(
                 "OpenAI Agents SDK is not installed.\n\n"
                 "Install from GitHub and retry:\n"
                 "  pip install git+https://github.com/openai/openai-agents-python\n\n"
                 f"Import error: {e}",
                 title="Agents SDK Missing",
                 style="red",
-            ))
+            )
             raise RuntimeError("OpenAI Agents SDK not available")
 
 
@@ -7,18 +7,31 @@ Run:
 
 import asyncio
 import json
-from rich.console import Console
-from rich.panel import Panel
+import os
+import sys
+from contextlib import AsyncExitStack
+from typing import Any, Coroutine, Dict, List
 
-from config import DEFAULT_DELAY_BETWEEN_SOURCES
+from config import (
+    AIRTABLE_BATCH_SIZE,
+    DEFAULT_DELAY_BETWEEN_SOURCES,
+    DEFAULT_MAX_CONCURRENT_SOURCES,
+    PROFILE_OUTPUT_PATH,
+)
 
+from _console import get_console as _console, print_panel as _print_panel
 from environment_setup import validate_and_setup_environment
-from server_manager import create_playwright_server
+from server_manager import PlaywrightServerManager, create_playwright_server
 from agent_runner import create_playwright_agent, run_agent_with_task
-from prompts import NARRATIVE_INSTRUCTIONS, generate_agent_instructions, FALLBACK_TASK_PROMPT
-from airtable_client import AirtableClient, AirtableConfig
+from prompts import generate_agent_instructions
+from airtable_client import AirtableClient, get_client, get_config
 
-console = Console()
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_JSON_DECODER = json.JSONDecoder()
 
 
 async def main() -> None:
@@ -27,106 +40,189 @@ async def main() -> None:
         # Step 1: Validate environment and setup
         validate_and_setup_environment()
 
-        airtable_config = AirtableConfig.from_env()
+        airtable_config = get_config()
         airtable_enabled = airtable_config.is_configured()
 
         if not airtable_enabled:
-            console.print(Panel(
+            _print_panel(
                 "Airtable not configured. Cannot fetch sources.",
                 title="Error",
                 style="red",
-            ))
+            )
             return
 
-        # Step 2: Fetch sources from Airtable
-        client = AirtableClient(airtable_config)
+        # Step 2: Fetch sources from Airtable while the Playwright server starts
+        client = get_client()
         sources_table_id = airtable_config.sources_table_id
         if not sources_table_id:
-            console.print(Panel(
+            _print_panel(
                 "AIRTABLE_SOURCES_TABLE_ID not set in environment.",
                 title="Error",
                 style="red",
-            ))
+            )
             return
-        sources = client.get_all_records(sources_table_id)
 
-        console.print(Panel(f"Fetched {len(sources)} sources from Airtable.", title="Sources", style="blue"))
+        async with AsyncExitStack() as stack:
+            playwright_manager = PlaywrightServerManager()
+            stack.push_async_callback(playwright_manager.stop_server)
+
+            sources_task = asyncio.create_task(asyncio.to_thread(client.get_all_records, sources_table_id))
+            startup_task = asyncio.create_task(playwright_manager.start_server())
+            try:
+                sources, _ = await asyncio.gather(sources_task, startup_task)
+            except BaseException:
+                for task in (sources_task, startup_task):
+                    task.cancel()
+                raise
+
+            _print_panel(f"Fetched {len(sources)} sources from Airtable.", title="Sources", style="blue")
+
+            if not sources:
+                _print_panel(
+                    "No sources found in Airtable.",
+                    title="Warning",
+                    style="yellow",
+                )
+                return
+
+            # Step 3: Scrape sources concurrently, bounded to limit rate limits,
+            # handing each source's records to the Airtable writer as it finishes
+            records_queue: asyncio.Queue = asyncio.Queue()
+            sync_task = asyncio.create_task(_sync_records(client, records_queue))
+            semaphore = asyncio.Semaphore(DEFAULT_MAX_CONCURRENT_SOURCES)
+            spacer = _StartSpacer(DEFAULT_DELAY_BETWEEN_SOURCES)
+            try:
+                results = await asyncio.gather(
+                    *(
+                        _scrape_source(source_record, playwright_manager, semaphore, spacer, records_queue)
+                        for source_record in sources
+                    ),
+                    return_exceptions=True,
+                )
+            finally:
+                records_queue.put_nowait(None)
+
+            for source_record, result in zip(sources, results):
+                if isinstance(result, BaseException):
+                    _console().print(f"Source {source_record.get('id')} failed: {result}")
 
-        if not sources:
-            console.print(Panel(
-                "No sources found in Airtable.",
-                title="Warning",
+        # Step 4: Wait for the remaining records to reach the Airtable offers table
+        if not await sync_task:
+            _print_panel(
+                "No records to add to Airtable.",
+                title="Airtable",
                 style="yellow",
-            ))
-            return
+            )
 
-        all_records = []
+    except Exception as e:
+        _console().print(f"Application error: {e}")
+        raise
 
-        # Step 3: For each source, scrape jobs
-        async with create_playwright_server() as playwright_server:
-            agent = create_playwright_agent(playwright_server)
 
-            for source_record in sources:
-                fields = source_record.get("fields", {})
-                source_url = fields.get("Job Boards")  # Field is "Job Boards"
+class _StartSpacer:
+    """Spaces successive starts at least `interval` seconds apart"""
 
-                if not source_url:
-                    console.print(f"Skipping source {source_record.get('id')} due to missing URL.")
-                    continue
+    def __init__(self, interval: float):
+        self._interval = interval
+        self._lock = asyncio.Lock()
+        self._next_start = 0.0
 
-                source_name = source_url  # Use URL as name for now
+    async def wait(self) -> None:
+        """Wait until the next start is allowed and reserve it"""
+        async with self._lock:
+            loop = asyncio.get_running_loop()
+            delay = self._next_start - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self._next_start = loop.time() + self._interval
 
-                # Build task prompt
-                task_prompt = generate_agent_instructions(url=source_url, source_name=source_name)
 
-                # Execute the task
-                result = await run_agent_with_task(agent, task_prompt)
+async def _scrape_source(
+    source_record: Dict[str, Any],
+    playwright_manager: PlaywrightServerManager,
+    semaphore: asyncio.Semaphore,
+    spacer: _StartSpacer,
+    records_queue: asyncio.Queue,
+) -> None:
+    """Scrape one Airtable source and queue the records parsed from the agent output"""
+    fields = source_record.get("fields", {})
+    source_url = fields.get("Job Boards")  # Field is "Job Boards"
 
-                # Parse and collect records
-                final_output = getattr(result, "final_output", None)
-                records = _parse_records(final_output) if final_output else None
-                if records:
-                    all_records.extend(records)
-                else:
-                    console.print(f"No valid records from {source_name}.")
+    if not source_url:
+        _console().print(f"Skipping source {source_record.get('id')} due to missing URL.")
+        return
 
-                # Delay between sources to reduce rate limits
-                await asyncio.sleep(DEFAULT_DELAY_BETWEEN_SOURCES)
+    source_name = source_url  # Use URL as name for now
 
-        # Step 4: Sync all results to Airtable offers table
-        if all_records:
-            client.create_records(all_records)
-        else:
-            console.print(Panel(
-                "No records to add to Airtable.",
-                title="Airtable",
-                style="yellow",
-            ))
+    # Build task prompt
+    task_prompt = generate_agent_instructions(url=source_url, source_name=source_name)
 
-    except Exception as e:
-        console.print(f"Application error: {e}")
-        raise
+    async with semaphore:
+        # Space agent starts apart to reduce rate limits
+        await spacer.wait()
+
+        # Each MCP session gets its own in-memory browser profile on the shared
+        # server (it runs with --isolated), so no cookies carry over between sources
+        async with create_playwright_server(playwright_manager) as playwright_server:
+            agent = create_playwright_agent(playwright_server)
+            result = await run_agent_with_task(agent, task_prompt)
+
+    # Parse and collect records
+    records = _parse_records(result.final_output)
+    if records:
+        records_queue.put_nowait(records)
+    else:
+        _console().print(f"No valid records from {source_name}.")
+
+
+async def _sync_records(client: AirtableClient, records_queue: asyncio.Queue) -> int:
+    """Write queued records to Airtable until a None sentinel arrives
+
+    Full batches are written as soon as they accumulate so Airtable writes
+    overlap with the sources still being scraped; the remainder is written at
+    the end. Returns the number of records created.
+    """
+    pending: List[Dict[str, Any]] = []
+    created = 0
+    while True:
+        records = await records_queue.get()
+        if records is None:
+            break
+        pending.extend(records)
+        full = len(pending) - len(pending) % AIRTABLE_BATCH_SIZE
+        if full:
+            created += len(await client.create_records_async(pending[:full]))
+            del pending[:full]
+
+    if pending:
+        created += len(await client.create_records_async(pending))
+    return created
 
 
 def _parse_records(output_text: str):
     if not output_text:
         return None
 
-    stripped = output_text.strip()
+    # The agent is asked to answer with a bare JSON array, so try the fast
+    # parser on the whole output first
+    if orjson is not None:
+        stripped = output_text.strip()
+        if stripped.startswith("["):
+            try:
+                parsed = orjson.loads(stripped)
+            except orjson.JSONDecodeError:
+                pass
+            else:
+                return parsed if isinstance(parsed, list) else None
 
-    # Handle console panels where JSON is enclosed between lines and optional narration
-    if stripped.startswith("[") and stripped.endswith("]"):
-        candidate = stripped
-    else:
-        # Try to locate the first '[' and last ']' to extract a JSON array
-        start = stripped.find("[")
-        end = stripped.rfind("]")
-        if start == -1 or end == -1 or end <= start:
-            return None
-        candidate = stripped[start : end + 1]
+    # Decode the first JSON array in the output and ignore any narration around
+    # it; raw_decode stops at the end of the array instead of rescanning for ']'
+    start = output_text.find("[")
+    if start == -1:
+        return None
 
     try:
-        parsed = json.loads(candidate)
+        parsed, _ = _JSON_DECODER.raw_decode(output_text, start)
     except json.JSONDecodeError:
         return None
 
@@ -135,10 +231,50 @@ def _parse_records(output_text: str):
     return None
 
 
-if __name__ == "__main__":
+async def _run_profiled() -> None:
+    """Run main() under pyinstrument's sampling profiler and save an HTML report."""
+    try:
+        from pyinstrument import Profiler
+    except ImportError as e:
+        raise RuntimeError(f"PROFILE is set but pyinstrument is not installed: {e}")
+
+    # async_mode attributes time spent awaiting to the awaiting coroutine
+    profiler = Profiler(async_mode="enabled")
+    profiler.start()
+    try:
+        await main()
+    finally:
+        profiler.stop()
+        profiler.write_html(PROFILE_OUTPUT_PATH)
+        _console().print(f"Profile written to {PROFILE_OUTPUT_PATH}")
+
+
+def _run_event_loop(coro: Coroutine[Any, Any, None]) -> None:
+    """Run coro on the libuv-based event loop when uvloop is available."""
+    try:
+        import uvloop
+    except ImportError:
+        uvloop = None
+
+    if uvloop is None or sys.platform == "win32":
+        asyncio.run(coro)
+    elif sys.version_info >= (3, 12):
+        asyncio.run(coro, loop_factory=uvloop.new_event_loop)
+    else:
+        # loop_factory is 3.12+; the policy install is deprecated from 3.12 on
+        uvloop.install()
+        asyncio.run(coro)
+
+
+def run() -> None:
+    """Command-line entry point: run main() and report fatal errors."""
     try:
-        asyncio.run(main())
+        _run_event_loop(_run_profiled() if os.getenv("PROFILE") else main())
     except KeyboardInterrupt:
-        console.print("Interrupted by user.")
+        _console().print("Interrupted by user.")
     except Exception as e:
-        console.print(Panel(str(e), title="Fatal Error", style="red"))
+        _print_panel(str(e), title="Fatal Error", style="red")
+
+
+if __name__ == "__main__":
+    run()
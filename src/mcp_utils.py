@@ -1,27 +1,88 @@
+import asyncio
+import random
 import socket
-import time
-import urllib.request
+from typing import Optional
+
+import httpx
+
+_BACKOFF_INITIAL_SECONDS = 0.05
+_BACKOFF_FACTOR = 1.7
+_BACKOFF_MAX_SECONDS = 2.0
+_TCP_PROBE_TIMEOUT_SECONDS = 0.5
+_PROBE_HTTP_TIMEOUT = httpx.Timeout(connect=0.5, read=1.0, write=1.0, pool=1.0)
+
+
+def reserve_port() -> socket.socket:
+    """Bind a socket to an available TCP port on localhost and return it.
+
+    The socket is never listened on, so while it stays open the port cannot be
+    handed out to other processes. On Linux a server started with SO_REUSEADDR
+    (as Node and most servers do) can still bind and listen on it; macOS and
+    the BSDs also require SO_REUSEPORT on the server's socket, so close the
+    reservation before starting a server there.
+    """
+    s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    try:
+        # Let the MCP server rebind the port even if it lingers in TIME_WAIT
+        s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        if hasattr(socket, "SO_REUSEPORT"):
+            s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        s.bind(("127.0.0.1", 0))
+    except OSError:
+        s.close()
+        raise
+    return s
 
 
 def find_free_port() -> int:
     """Return an available TCP port on localhost."""
-    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-        s.bind(("127.0.0.1", 0))
+    with reserve_port() as s:
         return s.getsockname()[1]
 
 
-def wait_http_ok(url: str, deadline: float) -> bool:
-    """Poll an HTTP URL until it responds or deadline passes.
+async def tcp_accepts(host: str, port: int, timeout: float = _TCP_PROBE_TIMEOUT_SECONDS) -> bool:
+    """Return whether a plain TCP connection to host:port is accepted."""
+    try:
+        _, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout=timeout)
+    except (OSError, asyncio.TimeoutError):
+        return False
+    writer.close()
+    return True
+
 
-    Designed for SSE endpoints as well; any successful response indicates readiness.
+async def wait_http_ok(url: str, timeout: float, client: Optional[httpx.AsyncClient] = None) -> bool:
+    """Wait until an HTTP URL starts responding or the timeout passes.
+
+    Polls with a cheap TCP connect until the port accepts connections, then
+    opens a streaming GET and returns once response headers arrive, so SSE
+    endpoints that never finish their response are handled as well; any
+    response indicates readiness. Failed probes are retried with exponential
+    backoff and jitter over a single retry-free connection pool.
     """
-    while time.time() < deadline:
-        try:
-            with urllib.request.urlopen(url, timeout=2) as resp:
-                # For SSE endpoints, just getting a response indicates readiness
-                if resp.status in (200, 204):
-                    return True
-                return True
-        except Exception:
-            time.sleep(0.2)
-    return False
+    parsed = httpx.URL(url)
+    host = parsed.host
+    port = parsed.port or (443 if parsed.scheme == "https" else 80)
+
+    async def _probe(session: httpx.AsyncClient) -> bool:
+        delay = _BACKOFF_INITIAL_SECONDS
+        while True:
+            if await tcp_accepts(host, port):
+                try:
+                    async with session.stream("GET", url):
+                        return True
+                except httpx.TransportError:
+                    pass
+            # Probe quickly at first, then back off with +/-25% jitter
+            await asyncio.sleep(delay * (0.75 + 0.5 * random.random()))
+            delay = min(delay * _BACKOFF_FACTOR, _BACKOFF_MAX_SECONDS)
+
+    try:
+        if client is not None:
+            return await asyncio.wait_for(_probe(client), timeout=timeout)
+        async with httpx.AsyncClient(
+            transport=httpx.AsyncHTTPTransport(retries=0),
+            timeout=_PROBE_HTTP_TIMEOUT,
+        ) as session:
+            return await asyncio.wait_for(_probe(session), timeout=timeout)
+    except asyncio.TimeoutError:
+        return False
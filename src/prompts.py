@@ -1,6 +1,6 @@
 """Agent prompts and instructions."""
 
-from typing import Any
+import json
 
 # Fallback task prompt when structured output isn't required
 FALLBACK_TASK_PROMPT = "Say hello to me bro!"
@@ -18,10 +18,25 @@ Be conversational and explain each step ultra briefly as you work. Use the prefi
 When you deliver the final answer, send ONLY a JSON array (no prefixes) that matches the schema below.
 """
 
-def generate_agent_instructions(url: str, source_name: str) -> str:
-    """Generate agent instructions with dynamic URL and source name."""
-    return f"""
-Scrape 2 junior Python jobs from {url}
+# Example record shown to the agent, serialized once at import
+_RECORD_EXAMPLE = json.dumps(
+    {
+        "Source": "$source_name",
+        "Link": "[valid job detail page URL]",
+        "Company": "[company name]",
+        "Position": "[position title]",
+        "Salary": "[salary or 'Not specified']",
+        "Location": "[location]",
+        "Notes": "Junior Python developer position",
+        "Requirements": "[key skills]",
+        "About company": "[description or 'Not available']",
+    },
+    indent=2,
+)
+
+# Per-source scraping task, filled in by generate_agent_instructions
+_AGENT_INSTRUCTIONS_TMPL = """
+Scrape 2 junior Python jobs from $url
 
 Important extraction guidelines:
 
@@ -46,18 +61,17 @@ For each job offer, go to its details page and extract:
 
 Return the final data using this JSON structure:
 ```
-{{
-  "Source": "{source_name}",
-  "Link": "[valid job detail page URL]",
-  "Company": "[company name]",
-  "Position": "[position title]",
-  "Salary": "[salary or 'Not specified']",
-  "Location": "[location]",
-  "Notes": "Junior Python developer position",
-  "Requirements": "[key skills]",
-  "About company": "[description or 'Not available']"
-}}
+""" + _RECORD_EXAMPLE + """
 ```
 
 Final answer must be a JSON array of objects in the exact format above and contain no other text. Only include offers where you have successfully validated all data.
 """
+
+# Split around the placeholders once so each call is a single join
+_INSTRUCTIONS_HEAD, _, _instructions_rest = _AGENT_INSTRUCTIONS_TMPL.partition("$url")
+_INSTRUCTIONS_BODY, _, _INSTRUCTIONS_TAIL = _instructions_rest.partition("$source_name")
+
+
+def generate_agent_instructions(url: str, source_name: str) -> str:
+    """Generate agent instructions with dynamic URL and source name."""
+    return "".join((_INSTRUCTIONS_HEAD, url, _INSTRUCTIONS_BODY, source_name, _INSTRUCTIONS_TAIL))
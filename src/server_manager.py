@@ -9,21 +9,87 @@ Handles the lifecycle of the Playwright MCP server:
 
 import asyncio
 import os
+import shutil
 import signal
-import subprocess
-from typing import Optional
-from contextlib import asynccontextmanager
-import glob
+import sys
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+from contextlib import AsyncExitStack, asynccontextmanager
+from functools import lru_cache
 
-from rich.console import Console
-from mcp_utils import find_free_port
+from _console import get_console
+from mcp_utils import reserve_port, wait_http_ok
 from config import (
+    MCP_DEFAULT_READY_WAIT_SECONDS,
     MCP_DEFAULT_SSE_TIMEOUT,
     MCP_DEFAULT_TOOL_TIMEOUT_SECONDS,
     MCP_PLAYWRIGHT_TIMEOUT_SECONDS,
 )
 
-console = Console()
+try:
+    from agents.mcp import MCPServerStreamableHttp
+except ImportError as e:
+    MCPServerStreamableHttp = None
+    _AGENTS_MCP_IMPORT_ERROR: Optional[ImportError] = e
+else:
+    _AGENTS_MCP_IMPORT_ERROR = None
+
+# Windows has no SIGKILL; send_signal(SIGTERM) terminates the process there
+_SIGKILL = getattr(signal, "SIGKILL", signal.SIGTERM)
+
+# Only Linux lets a server bind a port the parent still holds with SO_REUSEADDR alone
+_HOLD_PORT_UNTIL_READY = sys.platform.startswith("linux")
+
+_PLAYWRIGHT_MCP_NPX_COMMAND = ("npx", "-y", "@playwright/mcp@latest")
+_PLAYWRIGHT_MCP_BIN = "mcp-server-playwright"
+
+# Playwright's browser cache on macOS and the Chromium binary inside each install
+_PLAYWRIGHT_CACHE_DIR = os.path.expanduser("~/Library/Caches/ms-playwright")
+_CHROMIUM_MAC_BINARY = os.path.join("chrome-mac", "Chromium.app", "Contents", "MacOS", "Chromium")
+
+# Credentials the server never needs, kept out of its environment
+_PRIVATE_ENV_PREFIXES = ("OPENAI_", "AIRTABLE_")
+# --isolated keeps each session's browser profile in memory; the default
+# persistent profile can only be opened by one session at a time
+_PLAYWRIGHT_MCP_OPTIONS = (
+    "--isolated",
+    "--timeout-action", str(MCP_PLAYWRIGHT_TIMEOUT_SECONDS * 1000),
+    "--timeout-navigation", str(MCP_PLAYWRIGHT_TIMEOUT_SECONDS * 1000),
+)
+
+# Printed by Playwright MCP once its HTTP server is accepting connections
+_READY_LINE = b"Listening on"
+_OUTPUT_TAIL_LINES = 200
+_OVERLONG_LINE = b"[output line too long, skipped]\n"
+
+
+@lru_cache(maxsize=1)
+def _playwright_mcp_commands() -> Tuple[Tuple[str, ...], ...]:
+    """Return the commands to try for launching Playwright MCP, resolved once per process
+
+    An installed @playwright/mcp (the project's node_modules first, then a
+    global install) is run directly, skipping npx's package resolution and
+    update check. npx stays as the fallback in case that install is too old
+    for our options and exits during startup.
+    """
+    local_bin = os.path.join("node_modules", ".bin", _PLAYWRIGHT_MCP_BIN)
+    path = shutil.which(local_bin) or shutil.which(_PLAYWRIGHT_MCP_BIN)
+    if path:
+        return ((os.path.abspath(path),), _PLAYWRIGHT_MCP_NPX_COMMAND)
+    return (_PLAYWRIGHT_MCP_NPX_COMMAND,)
+
+
+def _server_env() -> Dict[str, str]:
+    """Return the environment for the server process without this app's credentials
+
+    Node, npx and Playwright read many variables (proxies, caches, browser
+    paths, display), so everything else is passed through unchanged.
+    """
+    return {
+        name: value
+        for name, value in os.environ.items()
+        if not name.startswith(_PRIVATE_ENV_PREFIXES)
+    }
 
 
 class PlaywrightServerManager:
@@ -31,156 +97,259 @@ class PlaywrightServerManager:
     
     def __init__(self, external_url: Optional[str] = None):
         self.external_url = external_url
-        self.server_process: Optional[subprocess.Popen] = None
+        self.server_process: Optional[asyncio.subprocess.Process] = None
         self.server_url: Optional[str] = None
+        # Last lines of server output, reported if the server fails to start
+        self._output_tail: Deque[bytes] = deque(maxlen=_OUTPUT_TAIL_LINES)
+        self._output_task: Optional[asyncio.Task] = None
+        # Log startup progress and echo all server output when PLAYWRIGHT_MCP_DEBUG
+        # is set; otherwise each start logs a single line, success or failure
+        self._debug = bool(os.getenv("PLAYWRIGHT_MCP_DEBUG"))
+        # In-flight start shared by concurrent start_server calls
+        self._starting: Optional[asyncio.Future] = None
     
-    def _detect_playwright_chromium(self) -> Optional[str]:
+    @staticmethod
+    @lru_cache(maxsize=1)
+    def _detect_playwright_chromium() -> Optional[str]:
         """Find Playwright-managed Chromium executable on macOS.
-        Returns absolute path if found, otherwise None.
+        Returns absolute path if found, otherwise None; the lookup runs once per process.
         """
         try:
-            cache_dir = os.path.expanduser("~/Library/Caches/ms-playwright")
-            pattern = os.path.join(
-                cache_dir,
-                "chromium-*",
-                "chrome-mac",
-                "Chromium.app",
-                "Contents",
-                "MacOS",
-                "Chromium",
-            )
-            candidates = glob.glob(pattern)
-            if not candidates:
-                return None
-            # Pick the most recently modified candidate
-            candidates.sort(key=lambda p: os.path.getmtime(p), reverse=True)
-            return candidates[0]
-        except Exception:
+            with os.scandir(_PLAYWRIGHT_CACHE_DIR) as it:
+                entries = [
+                    (entry.stat(follow_symlinks=False).st_mtime, entry.path)
+                    for entry in it
+                    if entry.name.startswith("chromium-") and entry.is_dir()
+                ]
+        except OSError:
             return None
+
+        # Prefer the most recently modified install that has the binary
+        for _, chromium_dir in sorted(entries, reverse=True):
+            path = os.path.join(chromium_dir, _CHROMIUM_MAC_BINARY)
+            if os.path.exists(path):
+                return path
+        return None
     
     async def start_server(self) -> str:
         """Start Playwright MCP server and return HTTP URL
         
+        Returns the existing URL if the server is already running; concurrent
+        calls share a single start instead of spawning a server each.
+        
         Raises:
             RuntimeError: If server fails to start or become ready
         """
+        if self.server_url is not None:
+            return self.server_url
+        if self._starting is not None:
+            return await asyncio.shield(self._starting)
+        
+        starting = self._starting = asyncio.get_running_loop().create_future()
+        try:
+            url = await self._start_server()
+        except BaseException as e:
+            if isinstance(e, Exception):
+                starting.set_exception(e)
+                # Callers that joined the start receive it; don't warn if there were none
+                starting.exception()
+            else:
+                starting.cancel()
+            raise
+        else:
+            starting.set_result(url)
+            return url
+        finally:
+            self._starting = None
+    
+    async def _start_server(self) -> str:
+        """Spawn the server process and wait until it is ready"""
         if self.external_url:
             self.server_url = self.external_url
-            console.log(f"[green]Using external Playwright MCP server at {self.server_url}")
+            get_console().log(f"[green]Using external Playwright MCP server at {self.server_url}")
             return self.server_url
         
-        port = find_free_port()
-        # Use the documented endpoint for HTTP transport
-        self.base_url = f"http://127.0.0.1:{port}"
-        self.server_url = f"{self.base_url}/mcp"  # HTTP transport endpoint per docs
-        
-        # Create output directory for logs
-        import tempfile
-        log_dir = tempfile.mkdtemp(prefix="playwright-mcp-")
-        
-        cmd = [
-            "npx", "-y", "@playwright/mcp@latest",
-            f"--port={port}",
-            "--host=127.0.0.1",
-            f"--output-dir={log_dir}",
-            "--timeout-action", str(MCP_PLAYWRIGHT_TIMEOUT_SECONDS * 1000),
-            "--timeout-navigation", str(MCP_PLAYWRIGHT_TIMEOUT_SECONDS * 1000)
-        ]
+        # On Linux, keep the port bound until the server answers so nothing else
+        # can take it in between; the server can still bind it via SO_REUSEADDR.
+        # Elsewhere (macOS/BSD) binding a held port also needs SO_REUSEPORT on the
+        # server's socket, which Node doesn't set, so the reservation is released.
+        port_holder = reserve_port()
+        port = port_holder.getsockname()[1]
+        if not _HOLD_PORT_UNTIL_READY:
+            port_holder.close()
+        # Use the documented endpoint for HTTP transport; server_url is only
+        # published once the server is ready, so callers never see a dead URL
+        base_url = f"http://127.0.0.1:{port}"
+        server_url = f"{base_url}/mcp"  # HTTP transport endpoint per docs
         
+        commands = _playwright_mcp_commands()
+        failure_output = ""
         try:
-            # Create a temporary file to store the output
-            import tempfile
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.log') as log_file:
-                log_path = log_file.name
-            
-            # Start the process with output redirected to the log file
-            self.server_process = subprocess.Popen(
-                cmd,
-                stdout=open(log_path, 'w'),
-                stderr=subprocess.STDOUT,
-                text=True,
-                bufsize=1,  # Line buffered
-                universal_newlines=True
-            )
-            
-            # Wait a bit for the process to start
-            console.log(f"[yellow]Waiting for server to start (PID: {self.server_process.pid})...")
-            await asyncio.sleep(5)  # Increased wait time
-            
-            # Check if the process is still running after initial wait
-            if self.server_process.poll() is not None:
-                # Process has already exited, read the log file
-                with open(log_path, 'r') as f:
-                    log_output = f.read()
+            for attempt, command in enumerate(commands, start=1):
+                cmd = [
+                    *command,
+                    f"--port={port}",
+                    "--host=127.0.0.1",
+                    *_PLAYWRIGHT_MCP_OPTIONS,
+                ]
+                if await self._spawn_and_wait(cmd, server_url):
+                    break
                 
-                # Try to get any error output from the log
-                error_msg = f"Process exited with code {self.server_process.returncode}.\n"
-                if log_output:
-                    error_msg += f"Log output:\n{log_output}"
-                else:
-                    error_msg += "No output was captured in the log file."
+                # Process has already exited; give the reader a moment to collect its
+                # last output (children left in the group may hold the pipe open)
+                await asyncio.wait({self._output_task}, timeout=1)
+                if attempt < len(commands):
+                    get_console().log(f"[yellow]{command[0]} exited during startup; falling back to npx")
+                    await self.stop_server()
+                    continue
                 
-                console.log(f"[red]{error_msg}")
-                raise RuntimeError("Failed to start Playwright MCP server")
+                # The output tail is logged once below; the error itself stays
+                # short since callers print it again
+                failure_output = b"".join(self._output_tail).decode(errors="replace")
+                raise RuntimeError(
+                    f"Playwright MCP server exited with code {self.server_process.returncode}"
+                )
             
-            # Assume server is ready at the documented endpoint
-            console.log(f"[green]Playwright MCP server is ready at {self.server_url}")
+            self.base_url = base_url
+            self.server_url = server_url
+            get_console().log(
+                f"[green]Playwright MCP server is ready at {self.server_url} (PID: {self.server_process.pid})"
+            )
             return self.server_url
             
         except Exception as e:
-            self.stop_server()
-            console.log(f"[red]Error starting Playwright MCP server: {str(e)}")
+            await self.stop_server()
+            error_msg = f"Error starting Playwright MCP server: {str(e)}"
+            if failure_output:
+                error_msg += f"\nLog output:\n{failure_output}"
+            get_console().log(f"[red]{error_msg}")
             raise
+        finally:
+            port_holder.close()
     
     
-    def stop_server(self):
-        """Stop the Playwright MCP server process and clean up related processes"""
+    async def _spawn_and_wait(self, cmd: List[str], server_url: str) -> bool:
+        """Spawn the server and wait until it is ready
+        
+        Returns False if the process exits during startup.
+        
+        Raises:
+            RuntimeError: If the server does not become ready in time
+        """
+        self.server_process = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.STDOUT,
+            env=_server_env(),
+            # Own process group, so stop_server can signal the whole tree
+            start_new_session=True,
+        )
+        # Drain the pipe for the life of the process so the server never
+        # blocks writing to it; the reader also spots the "Listening on" line
+        self._output_tail.clear()
+        listening = asyncio.get_running_loop().create_future()
+        self._output_task = asyncio.create_task(self._read_output(self.server_process.stdout, listening))
+        
+        # Wait for the ready line, falling back to polling the endpoint,
+        # and bail out early if the process exits
+        if self._debug:
+            get_console().log(f"[yellow]Waiting for server to start (PID: {self.server_process.pid})...")
+        ready_task = asyncio.create_task(wait_http_ok(server_url, MCP_DEFAULT_READY_WAIT_SECONDS))
+        exit_task = asyncio.create_task(self.server_process.wait())
+        try:
+            done, _ = await asyncio.wait(
+                {listening, ready_task, exit_task},
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+        finally:
+            for task in (ready_task, exit_task):
+                task.cancel()
+        
+        # Check if the process is still running
+        if self.server_process.returncode is not None:
+            return False
+        
+        if listening not in done and not (ready_task in done and ready_task.result()):
+            raise RuntimeError(
+                f"Playwright MCP server did not respond within {MCP_DEFAULT_READY_WAIT_SECONDS}s"
+            )
+        return True
+    
+    def _signal_server(self, sig: int) -> None:
+        """Signal the server's process group so npx and its node children both receive it"""
+        try:
+            if hasattr(os, "killpg"):
+                os.killpg(self.server_process.pid, sig)
+            else:
+                self.server_process.send_signal(sig)
+        except ProcessLookupError:
+            pass
+    
+    async def _read_output(self, stream: asyncio.StreamReader, listening: asyncio.Future) -> None:
+        """Collect server output lines, resolving `listening` once the server reports its address"""
+        while True:
+            try:
+                raw = await stream.readline()
+            except ValueError:
+                # Line longer than the stream limit; readline has already dropped
+                # it from the buffer, so note it and keep draining
+                self._output_tail.append(_OVERLONG_LINE)
+                continue
+            if not raw:
+                break
+            # Lines stay as bytes; they are only decoded if they get displayed
+            self._output_tail.append(raw)
+            if self._debug:
+                get_console().log(f"[dim]playwright-mcp: {raw.decode(errors='replace').rstrip()}")
+            if not listening.done() and _READY_LINE in raw:
+                listening.set_result(True)
+    
+    async def stop_server(self):
+        """Stop the Playwright MCP server process group"""
         if self.server_process:
             try:
-                # Try graceful shutdown first
-                self.server_process.send_signal(signal.SIGINT)
-                try:
-                    self.server_process.wait(timeout=5)
-                except subprocess.TimeoutExpired:
-                    # Force terminate if not responding
-                    self.server_process.terminate()
+                if self.server_process.returncode is None:
+                    # Try graceful shutdown first
+                    self._signal_server(signal.SIGINT)
                     try:
-                        self.server_process.wait(timeout=3)
-                    except subprocess.TimeoutExpired:
-                        # Last resort - force kill
-                        self.server_process.kill()
+                        await asyncio.wait_for(self.server_process.wait(), timeout=5)
+                    except asyncio.TimeoutError:
+                        # Force terminate if not responding
+                        self._signal_server(signal.SIGTERM)
+                        try:
+                            await asyncio.wait_for(self.server_process.wait(), timeout=3)
+                        except asyncio.TimeoutError:
+                            # Last resort - force kill
+                            self._signal_server(_SIGKILL)
+                            await self.server_process.wait()
+                # Sweep any children left in the group after npx itself exited
+                self._signal_server(_SIGKILL)
             except Exception as e:
-                console.log(f"[yellow]Warning: Error stopping server process: {e}")
+                get_console().log(f"[yellow]Warning: Error stopping server process: {e}")
             finally:
                 self.server_process = None
-        
-        # Additional cleanup for any remaining Node.js/Playwright processes
-        try:
-            # Kill any remaining Playwright MCP processes
-            subprocess.run(["pkill", "-f", "playwright/mcp"], 
-                         stderr=subprocess.DEVNULL, 
-                         stdout=subprocess.DEVNULL)
-            
-            # Kill any Node.js processes that might be related to Playwright
-            subprocess.run(["pkill", "-f", "node.*playwright"], 
-                         stderr=subprocess.DEVNULL, 
-                         stdout=subprocess.DEVNULL)
-        except Exception as e:
-            console.log(f"[yellow]Warning during process cleanup: {e}")
+        if self._output_task is not None:
+            self._output_task.cancel()
+            await asyncio.gather(self._output_task, return_exceptions=True)
+            self._output_task = None
+        self.server_url = None
 
 
 @asynccontextmanager
-async def create_playwright_server():
-    """Context manager that yields a ready Playwright MCP server"""
-    try:
-        from agents.mcp import MCPServerStreamableHttp
-    except ImportError as e:
-        raise RuntimeError(f"OpenAI Agents SDK not available: {e}")
+async def create_playwright_server(playwright_manager: Optional[PlaywrightServerManager] = None):
+    """Context manager that yields a ready Playwright MCP server
+
+    A manager whose server was already started can be passed in to reuse its
+    process; the caller then remains responsible for stopping it.
+    """
+    if _AGENTS_MCP_IMPORT_ERROR is not None:
+        raise RuntimeError(f"OpenAI Agents SDK not available: {_AGENTS_MCP_IMPORT_ERROR}")
 
-    playwright_manager = PlaywrightServerManager()
-    server = None
+    async with AsyncExitStack() as stack:
+        if playwright_manager is None:
+            playwright_manager = PlaywrightServerManager()
+            stack.push_async_callback(playwright_manager.stop_server)
 
-    try:
         playwright_url = await playwright_manager.start_server()
         server = MCPServerStreamableHttp(
             {
@@ -190,8 +359,5 @@ async def create_playwright_server():
             client_session_timeout_seconds=MCP_DEFAULT_TOOL_TIMEOUT_SECONDS,
         )
 
-        async with server:
-            yield server
-
-    finally:
-        playwright_manager.stop_server()
+        await stack.enter_async_context(server)
+        yield server